@@ -0,0 +1,53 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+_taylor_core.pyx
+Optional Cython accelerator for simulate_taylor.py.
+
+Provides clock_step(), a compiled drop-in for the clock-step function
+used by TaylorPolyPipeline.  simulate_taylor.py falls back to pure
+Python when this extension is not built.
+
+No bounds checking is done here: TaylorPolyPipeline.reconfigure verifies
+that c_rev has order+1 entries before any register is clocked.
+
+Build in place with:
+    python setup.py build_ext --inplace
+"""
+
+cimport numpy as cnp
+from libc.stdint cimport int64_t
+
+
+cdef inline int64_t _sext(int64_t v, int64_t mask, int64_t sign) noexcept nogil:
+    """Wrap v to DATA_WIDTH bits and sign-extend (branchless)."""
+    return ((v & mask) ^ sign) - sign
+
+
+cdef void _clock_step(int64_t* dx_r, int64_t* acc_r, cnp.npy_bool* vld_r,
+                      const int64_t* c_rev, Py_ssize_t N, int64_t x0, int FB,
+                      int64_t mask, int64_t sign, int64_t x_in,
+                      bint valid_in) noexcept nogil:
+    cdef Py_ssize_t i
+    # Stages N..1 read the previous-cycle value of stage i-1 before it is
+    # overwritten; stage 0 is written last.
+    for i in range(N, 0, -1):
+        acc_r[i] = _sext(c_rev[i] + ((dx_r[i-1] * acc_r[i-1]) >> FB),
+                         mask, sign)
+        dx_r[i]  = dx_r[i-1]
+        vld_r[i] = vld_r[i-1]
+
+    dx_r[0]  = _sext(x_in - x0, mask, sign)
+    acc_r[0] = c_rev[0]   # seed with c_ORDER
+    vld_r[0] = valid_in
+
+
+def clock_step(int64_t[::1] dx_r, int64_t[::1] acc_r, cnp.npy_bool[::1] vld_r,
+               const int64_t[::1] c_rev, int64_t x0, int FB, int64_t DW_MASK,
+               int64_t SIGN_BIT, int64_t x_in, bint valid_in):
+    """
+    Advance the pipeline registers by one rising clock edge, in place.
+
+    Same signature and semantics as simulate_taylor._clock_step.
+    """
+    _clock_step(&dx_r[0], &acc_r[0], &vld_r[0], &c_rev[0], dx_r.shape[0] - 1,
+                x0, FB, DW_MASK, SIGN_BIT, x_in, valid_in)
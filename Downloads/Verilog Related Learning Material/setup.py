@@ -0,0 +1,20 @@
+"""
+Build the optional Cython accelerator used by simulate_taylor.py:
+
+    python setup.py build_ext --inplace
+"""
+
+import numpy as np
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+setup(
+    name="taylor-core",
+    ext_modules=cythonize(
+        [Extension(
+            "_taylor_core", ["_taylor_core.pyx"],
+            include_dirs=[np.get_include()],
+            define_macros=[("NPY_NO_DEPRECATED_API", "NPY_1_7_API_VERSION")],
+        )],
+    ),
+)
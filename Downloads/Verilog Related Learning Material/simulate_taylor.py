@@ -8,26 +8,76 @@ Mirrors every fixed-point operation in the RTL:
   - ORDER+1 pipeline stages (Horner's method, one register per stage)
   - active-low async reset, valid handshake
 
+The per-cycle pipeline step uses the compiled _taylor_core extension when
+it has been built (python setup.py build_ext --inplace), and otherwise runs
+as plain Python, generated with its stages unrolled for the DUT's order.
+Batch evaluation of NUMBA_MIN_BATCH or more samples runs as one fused,
+parallel Numba kernel when Numba is installed; Numba is only imported then,
+since importing it costs more than it saves on smaller batches.  Other
+batches use the SIMD kernel in taylor_mac.c when that has been built as a
+shared library (see that file), and NumPy otherwise.
+
 Run with:
-    python simulate_taylor.py
+    python simulate_taylor.py [--cycle-accurate] [--verbose]
 """
 
+import argparse
+import ctypes
+import importlib.util
+import math
+import os
 import sys
+from collections import deque
+
+import numpy as np
+
+# Numba is optional and imported lazily (see _numba_eval_batch): importing
+# it and loading the cached kernel takes ~0.5 s, which the fused kernel only
+# wins back on batches of millions of samples.
+_HAVE_NUMBA = importlib.util.find_spec("numba") is not None
+NUMBA_MIN_BATCH = 10_000_000
+prange = range                            # numba.prange once Numba is loaded
+_eval_batch_jit = None
+
+try:
+    import _taylor_core                   # optional Cython accelerator
+except ImportError:
+    _taylor_core = None
+
+# Whether the clock step runs as compiled code operating on NumPy register
+# arrays; otherwise plain Python lists of ints are faster.
+_NATIVE_STEP = _taylor_core is not None
+
+
+def _load_taylor_mac():
+    """Load the optional SIMD Horner-stage kernel built from taylor_mac.c."""
+    name = "taylor_mac.dll" if sys.platform == "win32" else "libtaylor_mac.so"
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+    try:
+        lib = ctypes.CDLL(path)
+    except OSError:
+        return None
+    i32_array = np.ctypeslib.ndpointer(dtype=np.int32, flags="C_CONTIGUOUS")
+    fn = lib.taylor_mac
+    fn.argtypes = [i32_array, i32_array, ctypes.c_int32, ctypes.c_int,
+                   ctypes.c_size_t]
+    fn.restype = None
+    return fn
+
+
+_taylor_mac = _load_taylor_mac()
 
 # ---------------------------------------------------------------------------
 # Fixed-point helpers
 # ---------------------------------------------------------------------------
 
 def to_signed(v, bits):
-    """Reinterpret an unsigned integer as a signed two's-complement integer."""
-    if v >= (1 << (bits - 1)):
-        v -= (1 << bits)
-    return v
-
-
-def to_unsigned(v, bits):
-    """Mask a (possibly negative) integer to its unsigned bits-wide value."""
-    return v & ((1 << bits) - 1)
+    """
+    Reinterpret the low `bits` bits of v as a signed two's-complement integer.
+    v may be a Python int or an int64 NumPy array.
+    """
+    sign = 1 << (bits - 1)
+    return ((v & ((sign << 1) - 1)) ^ sign) - sign
 
 
 def fp_mul_trunc(a, b, data_width, frac_bits):
@@ -37,22 +87,20 @@ def fp_mul_trunc(a, b, data_width, frac_bits):
     Matches the RTL:
         prod_full  = a * b;                              // 2*data_width bits
         prod_trunc = prod_full[data_width+frac_bits-1 : frac_bits]
-    """
-    product = a * b                                      # exact signed product
-    # Arithmetic right-shift by frac_bits then mask to data_width bits
-    shifted = product >> frac_bits
-    return to_signed(to_unsigned(shifted, data_width), data_width)
 
+    Standalone reference helper: TaylorPolyPipeline inlines this operation
+    in its clock step and batch kernels and does not call it.
 
-def real_to_fp(r, frac_bits, data_width):
-    """Convert a Python float to signed Q fixed-point integer."""
-    raw = int(round(r * (1 << frac_bits)))
-    return to_signed(to_unsigned(raw, data_width), data_width)
-
-
-def fp_to_real(v, frac_bits):
-    """Convert a signed fixed-point integer to float."""
-    return v / (1 << frac_bits)
+    a and b may be Python ints or int64 NumPy arrays.  For data_width <= 32
+    the product of two in-range operands fits in 64 bits, so array inputs
+    stay in native int64 arithmetic.  Scalars are left as Python ints: for
+    32-bit operands (two 30-bit PyLong digits) CPython's multiply is still
+    cheaper than NumPy scalar dispatch.
+    """
+    # a and b are already sign-extended, so the arithmetic right-shift of
+    # the exact product is the signed truncated result; wrap to data_width.
+    shifted = (a * b) >> frac_bits
+    return to_signed(shifted, data_width)
 
 
 # ---------------------------------------------------------------------------
@@ -60,6 +108,105 @@ def fp_to_real(v, frac_bits):
 # (called once per clock cycle per stage)
 # ---------------------------------------------------------------------------
 
+def _clock_step(dx_r, acc_r, vld_r, c_rev, x0, FB, DW_MASK, SIGN_BIT,
+                x_in, valid_in):
+    """
+    Advance the pipeline registers by one rising clock edge, in place.
+
+    Reference form of the clock step; TaylorPolyPipeline binds the
+    equivalent Cython clock_step or the unrolled _specialized_clock.
+
+    dx_r / acc_r are int64 arrays and vld_r a bool array of length N+1.
+    c_rev holds the coefficients in Horner order: c_rev[i] = c_(N-i).
+    Stages are written from N down to 1 so that each stage reads the
+    previous-cycle value of stage i-1 before it is overwritten; stage 0
+    is written last.  Registers hold sign-extended values, so the shifted
+    product is already the signed truncated product and is wrapped to
+    DATA_WIDTH only on the store, with the branchless ((v ^ SIGN) - SIGN).
+    """
+    N = dx_r.shape[0] - 1
+    for i in range(N, 0, -1):
+        acc = (c_rev[i] + ((dx_r[i-1] * acc_r[i-1]) >> FB)) & DW_MASK
+        acc_r[i] = (acc ^ SIGN_BIT) - SIGN_BIT
+        dx_r[i]  = dx_r[i-1]
+        vld_r[i] = vld_r[i-1]
+
+    # Stage 0 (combinational inputs -> stage-0 registers)
+    dx = (x_in - x0) & DW_MASK
+    dx_r[0]  = (dx ^ SIGN_BIT) - SIGN_BIT
+    acc_r[0] = c_rev[0]   # seed with c_ORDER
+    vld_r[0] = valid_in
+
+
+# Unrolled clock-step functions, generated once per pipeline order
+_SPECIALIZED_CLOCKS = {}
+
+
+def _specialized_clock(N):
+    """
+    Return a pure-Python equivalent of _clock_step with the N+1 pipeline
+    stages unrolled, for registers and coefficients held as Python lists.
+
+    Used when the Cython extension is not built; the straight-line code
+    avoids the interpreter's loop and index arithmetic.
+    """
+    step = _SPECIALIZED_CLOCKS.get(N)
+    if step is not None:
+        return step
+
+    lines = [
+        "def step(dx_r, acc_r, vld_r, c_rev, x0, FB, DW_MASK, SIGN_BIT,",
+        "         x_in, valid_in):",
+    ]
+    for i in range(N, 0, -1):
+        lines += [
+            f"    acc = (c_rev[{i}] + ((dx_r[{i-1}] * acc_r[{i-1}]) >> FB))"
+            " & DW_MASK",
+            f"    acc_r[{i}] = (acc ^ SIGN_BIT) - SIGN_BIT",
+            f"    dx_r[{i}] = dx_r[{i-1}]",
+            f"    vld_r[{i}] = vld_r[{i-1}]",
+        ]
+    lines += [
+        "    dx = (x_in - x0) & DW_MASK",
+        "    dx_r[0] = (dx ^ SIGN_BIT) - SIGN_BIT",
+        "    acc_r[0] = c_rev[0]",
+        "    vld_r[0] = valid_in",
+    ]
+    ns = {}
+    exec("\n".join(lines), ns)
+    step = _SPECIALIZED_CLOCKS[N] = ns["step"]
+    return step
+
+
+def _eval_batch(xfp, x0, c_rev, N, FB, DW_MASK, SIGN_BIT):
+    """
+    Fused batch evaluation: one pass over the samples, with dx and the
+    accumulator held in registers across all N Horner stages, so no
+    per-stage temporary arrays are written.  Samples run in parallel.
+
+    Compiled on demand by _numba_eval_batch.
+    """
+    out = np.empty_like(xfp)
+    for j in prange(xfp.shape[0]):
+        dx  = (((xfp[j] - x0) & DW_MASK) ^ SIGN_BIT) - SIGN_BIT
+        acc = c_rev[0]
+        for i in range(1, N + 1):
+            acc = (((c_rev[i] + ((acc * dx) >> FB)) & DW_MASK) ^ SIGN_BIT) \
+                - SIGN_BIT
+        out[j] = acc
+    return out
+
+
+def _numba_eval_batch():
+    """Import Numba and compile (or load from cache) the fused batch kernel."""
+    global _eval_batch_jit, prange
+    if _eval_batch_jit is None:
+        import numba
+        prange = numba.prange             # resolved when the kernel compiles
+        _eval_batch_jit = numba.njit(parallel=True, cache=True)(_eval_batch)
+    return _eval_batch_jit
+
+
 class TaylorPolyPipeline:
     """
     RTL-accurate pipeline model of taylor_poly.v.
@@ -70,70 +217,239 @@ class TaylorPolyPipeline:
                (length must be >= order+1)
     order    : polynomial degree
     x0       : expansion point in fixed-point
-    data_width, frac_bits : fixed-point format
+    data_width, frac_bits : fixed-point format (data_width <= 32, so that
+               every product fits in a 64-bit integer)
     """
 
     def __init__(self, coeffs, order, x0=0, data_width=32, frac_bits=16):
-        self.coeffs     = coeffs
-        self.order      = order
-        self.x0         = x0
+        if data_width > 32:
+            raise ValueError(
+                f"data_width must be <= 32 for int64 products, got {data_width}")
         self.DW         = data_width
         self.FB         = frac_bits
-        self.latency    = order + 1
 
-        # Pipeline registers: dx_r[i], acc_r[i], vld_r[i]  for i = 0..order
-        self.dx_r  = [0] * (order + 1)
-        self.acc_r = [0] * (order + 1)
-        self.vld_r = [False] * (order + 1)
+        # Fixed-point constants, computed once per DUT
+        self._scale     = 1 << frac_bits
+        self._mask      = (1 << data_width) - 1
+        self._sign_bit  = 1 << (data_width - 1)
 
-    def reset(self):
-        self.dx_r  = [0] * (self.order + 1)
-        self.acc_r = [0] * (self.order + 1)
-        self.vld_r = [False] * (self.order + 1)
+        self.order      = None
+        self.reconfigure(coeffs, order, x0)
 
-    def clock(self, valid_in, x_in):
+    def reconfigure(self, coeffs, order, x0=0):
         """
-        Simulate one rising clock edge.
-        Returns (valid_out, y_out).
+        Load new coefficients, order and expansion point, and reset the
+        pipeline.  The register arrays are reused when order is unchanged.
         """
-        DW = self.DW
-        FB = self.FB
-        N  = self.order
+        if order < 0:
+            raise ValueError(f"order must be >= 0, got {order}")
+        if len(coeffs) < order + 1:
+            raise ValueError(
+                f"need at least order+1 = {order + 1} coefficients, "
+                f"got {len(coeffs)}")
+        self.coeffs     = np.asarray(coeffs, dtype=np.int64)
+        self.x0         = x0
 
-        # ── Stage 0 (combinational inputs → stage-0 registers) ────────────────
-        # Must compute new stage-0 values BEFORE overwriting, since later
-        # stages read previous-cycle values of lower-numbered stages.
-        # We therefore compute all next-state values first, then commit.
+        # Coefficients in Horner (stage) order: _c_rev[i] = c_(order-i),
+        # wrapped to DATA_WIDTH like the RTL's COEFFS parameter
+        c_rev = self.coeffs[order::-1] & self._mask
+        self._c_rev = np.ascontiguousarray((c_rev ^ self._sign_bit)
+                                           - self._sign_bit)
+        # ... and as the clock step wants them (a list of ints in pure Python)
+        self._step_c_rev = self._c_rev if _NATIVE_STEP else self._c_rev.tolist()
 
-        # Compute next state for stage 0
-        dx_next_0  = to_signed(to_unsigned(x_in - self.x0, DW), DW)
-        acc_next_0 = self.coeffs[N]   # seed with c_ORDER
-        vld_next_0 = valid_in
+        if order == self.order:
+            self.reset()
+            return
 
-        # Compute next state for stages 1..ORDER
-        dx_next  = [None] * (N + 1)
-        acc_next = [None] * (N + 1)
-        vld_next = [None] * (N + 1)
+        self.order      = order
+        self.latency    = order + 1
 
-        dx_next[0]  = dx_next_0
-        acc_next[0] = acc_next_0
-        vld_next[0] = vld_next_0
+        # Pipeline registers: dx_r[i], acc_r[i], vld_r[i]  for i = 0..order
+        # Allocated once (one flat array or list per signal) and updated in
+        # place.  Compiled steps need NumPy arrays; the pure-Python step is
+        # faster on lists, since indexing an array boxes a NumPy scalar.
+        if _NATIVE_STEP:
+            self.dx_r  = np.zeros(order + 1, dtype=np.int64)
+            self.acc_r = np.zeros(order + 1, dtype=np.int64)
+            self.vld_r = np.zeros(order + 1, dtype=np.bool_)
+        else:
+            self.dx_r  = [0] * (order + 1)
+            self.acc_r = [0] * (order + 1)
+            self.vld_r = [False] * (order + 1)
 
-        for i in range(1, N + 1):
-            prod_trunc   = fp_mul_trunc(self.dx_r[i-1], self.acc_r[i-1], DW, FB)
-            coeff_k      = self.coeffs[N - i]
-            acc_new      = to_signed(
-                to_unsigned(coeff_k + prod_trunc, DW), DW)
-            dx_next[i]   = self.dx_r[i-1]
-            acc_next[i]  = acc_new
-            vld_next[i]  = self.vld_r[i-1]
+        self._bind_clock_step()
+
+    def _bind_clock_step(self):
+        """Bind the fastest available clock-step function for this DUT."""
+        if _taylor_core is not None:
+            self._step = _taylor_core.clock_step
+        else:
+            self._step = _specialized_clock(self.order)
+
+    def reset(self):
+        # Clear the preallocated registers in place (no reallocation)
+        if _NATIVE_STEP:
+            self.dx_r.fill(0)
+            self.acc_r.fill(0)
+            self.vld_r.fill(False)
+        else:
+            n = self.order + 1
+            self.dx_r[:]  = [0] * n
+            self.acc_r[:] = [0] * n
+            self.vld_r[:] = [False] * n
+
+    def to_fp(self, r):
+        """
+        Convert a float (or array of floats) to this DUT's signed fixed-point
+        format, rounding half to even as round() does.  Returns an int for a
+        scalar and an int64 array otherwise.
+
+        Raises ValueError for NaN and OverflowError for values whose scaled
+        magnitude does not fit in 64 bits (including inf).
+        """
+        scaled = np.asarray(r, dtype=np.float64) * self._scale
+        if np.isnan(scaled).any():
+            raise ValueError("cannot convert NaN to fixed-point")
+        if not (np.abs(scaled) < 2.0 ** 63).all():
+            raise OverflowError("value too large for 64-bit fixed-point")
+        raw = np.rint(scaled).astype(np.int64) & self._mask
+        v   = (raw ^ self._sign_bit) - self._sign_bit
+        return int(v) if v.ndim == 0 else v
+
+    def to_real(self, v):
+        """
+        Convert a signed fixed-point integer (or int array) in this DUT's
+        format to float.
+        """
+        return v / self._scale
 
-        # Commit
-        self.dx_r  = dx_next
-        self.acc_r = acc_next
-        self.vld_r = vld_next
+    def clock(self, valid_in, x_in):
+        """
+        Simulate one rising clock edge.
+        Returns (valid_out, y_out).
+        """
+        N = self.order
+        self._step(self.dx_r, self.acc_r, self.vld_r, self._step_c_rev,
+                   self.x0, self.FB, self._mask, self._sign_bit,
+                   x_in, valid_in)
+        return bool(self.vld_r[N]), int(self.acc_r[N])
+
+    def batch_backends(self):
+        """Names of the evaluate_batch backends usable at this width."""
+        names = ["numpy"]
+        if _taylor_mac is not None and self.DW == 32:
+            names.append("simd")
+        if _HAVE_NUMBA:
+            names.append("numba")
+        return names
+
+    def evaluate_batch(self, xfp, backend=None):
+        """
+        Evaluate the polynomial for a whole vector of fixed-point inputs.
+
+        The pipeline is feed-forward with no cross-sample state, so every
+        sample can be folded through the Horner stages at once.  Returns
+        an int64 array equal to the y_out values the pipeline would emit,
+        in input order.
+
+        With Numba installed, batches of at least NUMBA_MIN_BATCH samples
+        (or any batch, once Numba has been loaded) run as a single fused,
+        parallel kernel.  Otherwise, for DATA_WIDTH = 32 the stages run in
+        the SIMD taylor_mac kernel when libtaylor_mac has been built, and
+        in NumPy in all other cases.  Pass backend ("numba", "simd" or
+        "numpy") to force one; a backend missing from batch_backends()
+        raises ValueError.
+        """
+        mask = self._mask
+        sign = self._sign_bit
+        FB   = self.FB
+
+        # Every backend works on a flat contiguous vector; the result is
+        # reshaped back to the input's shape (0-d for a scalar input)
+        xfp  = np.asarray(xfp, dtype=np.int64)
+        flat = np.ascontiguousarray(xfp).reshape(-1)
+
+        if backend is None:
+            if _HAVE_NUMBA and (_eval_batch_jit is not None
+                                or flat.size >= NUMBA_MIN_BATCH):
+                backend = "numba"
+            elif _taylor_mac is not None and self.DW == 32:
+                backend = "simd"
+            else:
+                backend = "numpy"
+        elif backend not in self.batch_backends():
+            raise ValueError(f"batch backend {backend!r} is not available")
+
+        if backend == "numba":
+            kernel = _numba_eval_batch()
+            return kernel(flat, self.x0, self._c_rev, self.order, FB,
+                          mask, sign).reshape(xfp.shape)
+
+        dx  = (flat - self.x0) & mask
+        dx  = (dx ^ sign) - sign
+
+        if backend == "simd":
+            # _c_rev is already wrapped to 32 bits, so this is exact
+            c32  = self._c_rev.astype(np.int32)
+            dx32 = dx.astype(np.int32)
+            acc  = np.full(flat.shape, c32[0], dtype=np.int32)
+            for coeff_k in c32[1:]:
+                _taylor_mac(acc, dx32, int(coeff_k), FB, acc.size)
+            return acc.astype(np.int64).reshape(xfp.shape)
+
+        acc = np.full_like(dx, self._c_rev[0])
+        for coeff_k in self._c_rev[1:]:
+            prod = (acc * dx) >> FB
+            acc  = (coeff_k + prod) & mask
+            acc  = (acc ^ sign) - sign
+        return acc.reshape(xfp.shape)
+
+    def _clocked_outputs(self, xfp, step):
+        """
+        Clock xfp through fresh registers with the given step function, one
+        sample per cycle, then drain.  Returns the y_out values in order.
+        """
+        n     = self.order + 1
+        dx_r  = np.zeros(n, dtype=np.int64)
+        acc_r = np.zeros(n, dtype=np.int64)
+        vld_r = np.zeros(n, dtype=np.bool_)
+        xs    = [int(x) for x in np.asarray(xfp).reshape(-1)]
+
+        out = []
+        for cycle in range(len(xs) + self.latency):
+            valid = cycle < len(xs)
+            step(dx_r, acc_r, vld_r, self._c_rev, self.x0, self.FB,
+                 self._mask, self._sign_bit, xs[cycle] if valid else 0, valid)
+            if vld_r[n - 1]:
+                out.append(int(acc_r[n - 1]))
+        return np.asarray(out, dtype=np.int64)
+
+    def check_backends(self, xfp, numba=False):
+        """
+        Cross-check the accelerated backends on the fixed-point inputs xfp
+        against the looped reference _clock_step.  Returns the names of the
+        backends whose outputs differ (empty when all agree bit for bit).
 
-        return self.vld_r[N], self.acc_r[N]
+        The Numba kernel is checked when it is already loaded, or when
+        numba=True (which pays the Numba import and JIT compile).
+        """
+        ref   = self._clocked_outputs(xfp, _clock_step)
+        steps = {"python clock": _specialized_clock(self.order)}
+        if _taylor_core is not None:
+            steps["cython clock"] = _taylor_core.clock_step
+
+        bad = [name for name, step in steps.items()
+               if not np.array_equal(self._clocked_outputs(xfp, step), ref)]
+        for backend in ("numba", "simd", "numpy"):
+            if backend not in self.batch_backends():
+                continue
+            if backend == "numba" and not numba and _eval_batch_jit is None:
+                continue
+            out = self.evaluate_batch(xfp, backend=backend)
+            if not np.array_equal(out.reshape(-1), ref):
+                bad.append(f"{backend} batch")
+        return bad
 
 
 # ---------------------------------------------------------------------------
@@ -148,66 +464,106 @@ RESET  = "\033[0m"
 
 
 def _pass(label, got, expected):
-    print(f"  {GREEN}[PASS]{RESET}  {label:20s}  "
-          f"y = {got:12.7f}   (expected {expected:12.7f})")
+    return ("  %s[PASS]%s  %-20s  y = %12.7f   (expected %12.7f)"
+            % (GREEN, RESET, label, got, expected))
 
 
 def _fail(label, got, expected, err):
-    print(f"  {RED}[FAIL]{RESET}  {label:20s}  "
-          f"y = {got:12.7f}   (expected {expected:12.7f})   err = {err:.3e}")
+    return (f"  {RED}[FAIL]{RESET}  {label:20s}  "
+            f"y = {got:12.7f}   (expected {expected:12.7f})   err = {err:.3e}")
+
+
+def _mismatch(label, backend):
+    return (f"  {RED}[FAIL]{RESET}  {label:20s}  "
+            f"{backend} backend disagrees with the reference clock step")
 
 
 # ---------------------------------------------------------------------------
 # Test runner – drives a TaylorPolyPipeline exactly as taylor_poly_tb.v does
 # ---------------------------------------------------------------------------
 
-def run_test(dut, x_values, expected_reals, label, tol_lsb):
+def run_test(dut, x_values, expected_reals, label, tol_lsb,
+             cycle_accurate=False, verbose=False, self_check=True,
+             check_numba=False):
     """
-    Apply x_values one per clock, then drain the pipeline.
-    Check each output against expected_reals with tolerance tol_lsb LSBs.
+    Evaluate x_values on the DUT and check each output against
+    expected_reals with tolerance tol_lsb LSBs.
+
+    By default all samples are evaluated at once with
+    TaylorPolyPipeline.evaluate_batch.  With cycle_accurate=True the
+    x_values are applied one per clock and the pipeline is drained,
+    exactly as taylor_poly_tb.v does.
+
+    Outputs are checked in one vectorised comparison; only failures are
+    reported unless verbose=True.  With self_check=True the accelerated
+    backends are also cross-checked on x_values (see check_backends), and
+    each one that disagrees counts as a failure.  check_numba=True adds
+    the Numba kernel to that check even if it has not been loaded yet.
     """
-    FB     = dut.FB
-    scale  = 1 << FB
-    tol    = tol_lsb / scale
+    tol    = dut.to_real(tol_lsb)
 
     # Convert x values to fixed-point
-    xfp = [real_to_fp(x, FB, dut.DW) for x in x_values]
+    xfp = dut.to_fp(np.asarray(x_values, dtype=np.float64))
+
+    if not cycle_accurate:
+        yout_arr     = dut.evaluate_batch(xfp)
+        expected_arr = np.asarray(expected_reals, dtype=np.float64)
+    else:
+        # Expected value shift-register (mirrors testbench)
+        sr = deque([0.0] * dut.latency, maxlen=dut.latency)
+        yout_list = []
+        exp_list  = []
+
+        total_cycles = len(x_values) + dut.latency
+
+        for cycle in range(total_cycles):
+            # Drive input
+            if cycle < len(x_values):
+                vin  = True
+                xin  = int(xfp[cycle])
+                exp  = expected_reals[cycle]
+            else:
+                vin  = False
+                xin  = 0
+                exp  = 0.0
+
+            # Shift expected SR
+            sr.appendleft(exp)
+
+            # Clock the DUT
+            vout, yout = dut.clock(vin, xin)
+
+            # Collect output when valid
+            if vout:
+                yout_list.append(yout)
+                exp_list.append(sr[-1])
+
+        yout_arr     = np.asarray(yout_list, dtype=np.int64)
+        expected_arr = np.asarray(exp_list, dtype=np.float64)
 
-    # Expected value shift-register (mirrors testbench)
-    sr = [0.0] * dut.latency
+    got_arr = dut.to_real(yout_arr)
+    err_arr = np.abs(got_arr - expected_arr)
+    ok      = err_arr <= tol
 
-    pass_cnt = fail_cnt = 0
-    total_cycles = len(x_values) + dut.latency
+    pass_cnt = int(ok.sum())
+    fail_cnt = ok.size - pass_cnt
 
-    for cycle in range(total_cycles):
-        # Drive input
-        if cycle < len(x_values):
-            vin  = True
-            xin  = xfp[cycle]
-            exp  = expected_reals[cycle]
+    # Format the report lines, then emit them with a single write
+    lines = []
+    for i in (range(ok.size) if verbose else np.flatnonzero(~ok)):
+        lbl = f"{label}  x={x_values[i]:.3f}"
+        if ok[i]:
+            lines.append(_pass(lbl, got_arr[i], expected_arr[i]))
         else:
-            vin  = False
-            xin  = 0
-            exp  = 0.0
-
-        # Shift expected SR
-        sr = [exp] + sr[:-1]
-
-        # Clock the DUT
-        vout, yout = dut.clock(vin, xin)
-
-        # Check output when valid
-        if vout:
-            got      = fp_to_real(yout, FB)
-            expected = sr[-1]
-            err      = abs(got - expected)
-            lbl      = f"{label}  x={x_values[cycle - dut.latency]:.3f}"
-            if err <= tol:
-                _pass(lbl, got, expected)
-                pass_cnt += 1
-            else:
-                _fail(lbl, got, expected, err)
-                fail_cnt += 1
+            lines.append(_fail(lbl, got_arr[i], expected_arr[i], err_arr[i]))
+
+    if self_check:
+        bad = dut.check_backends(xfp, numba=check_numba)
+        fail_cnt += len(bad)
+        lines.extend(_mismatch(label, name) for name in bad)
+
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
     return pass_cnt, fail_cnt
 
@@ -216,7 +572,32 @@ def run_test(dut, x_values, expected_reals, label, tol_lsb):
 # Main
 # ---------------------------------------------------------------------------
 
-def main():
+# 1/k! for k = 0..4: coefficients of the 5-term e^x polynomial
+INV_FACT = tuple(1.0 / math.factorial(k) for k in range(5))
+
+
+def _poly5(x):
+    """Evaluate the 5-term e^x polynomial in Horner form."""
+    p = INV_FACT[4]
+    for c in reversed(INV_FACT[:4]):
+        p = p * x + c
+    return p
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Bit-accurate Python model of taylor_poly.v + the "
+                    "taylor_poly_tb.v test vectors.")
+    parser.add_argument("--cycle-accurate", action="store_true",
+                        help="clock each sample through the pipeline "
+                             "instead of evaluating the batch at once")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="print every checked sample, not only failures")
+    parser.add_argument("--check-numba", action="store_true",
+                        help="include the Numba batch kernel in the backend "
+                             "self-check (imports and compiles Numba)")
+    args = parser.parse_args(argv)
+
     DW    = 32
     FB    = 16
     SCALE = 1 << FB
@@ -242,13 +623,17 @@ def main():
     # coeffs[k] = c_k  →  c0=0, c1=0, c2=1.0
     quad_coeffs = [FP_0, FP_0, FP_1, FP_0, FP_0, FP_0, FP_0, FP_0]
 
-    dut_quad = TaylorPolyPipeline(
+    # One DUT model is reused for both tests, reconfigured in between
+    dut = TaylorPolyPipeline(
         coeffs=quad_coeffs, order=2, x0=0, data_width=DW, frac_bits=FB)
 
     x_quad    = [-3.0, -2.0, -1.0, 0.0, 1.0, 2.0, 3.0]
     exp_quad  = [x**2 for x in x_quad]
 
-    p, f = run_test(dut_quad, x_quad, exp_quad, "x^2", tol_lsb=2)
+    p, f = run_test(dut, x_quad, exp_quad, "x^2", tol_lsb=2,
+                    cycle_accurate=args.cycle_accurate,
+                    verbose=args.verbose,
+                    check_numba=args.check_numba)
     total_pass += p;  total_fail += f
 
     # ── Test 2: e^x  5-term  ORDER=4, X0=0 ───────────────────────────────────
@@ -258,17 +643,16 @@ def main():
     exp_coeffs = [FP_1, FP_1, FP_HALF, FP_1_6, FP_1_24,
                   FP_0, FP_0, FP_0]
 
-    dut_exp = TaylorPolyPipeline(
-        coeffs=exp_coeffs, order=4, x0=0, data_width=DW, frac_bits=FB)
+    dut.reconfigure(coeffs=exp_coeffs, order=4, x0=0)
 
     x_exp = [-1.0, 0.0, 0.5, 1.0, 2.0, 0.25]
     # True polynomial value (5-term), NOT exp() — this is what the hardware computes
-    exp_exp = [
-        sum((xv**k) / _factorial(k) for k in range(5))
-        for xv in x_exp
-    ]
+    exp_exp = [_poly5(xv) for xv in x_exp]
 
-    p, f = run_test(dut_exp, x_exp, exp_exp, "e^x", tol_lsb=16)
+    p, f = run_test(dut, x_exp, exp_exp, "e^x", tol_lsb=16,
+                    cycle_accurate=args.cycle_accurate,
+                    verbose=args.verbose,
+                    check_numba=args.check_numba)
     total_pass += p;  total_fail += f
 
     # ── Summary ───────────────────────────────────────────────────────────────
@@ -282,23 +666,15 @@ def main():
 
     # ── Extra: show approximation vs exact e^x ────────────────────────────────
     print(f"\n{YELLOW}--- Approximation quality: 5-term e^x vs math.exp() ---{RESET}")
-    import math
     print(f"  {'x':>6}  {'5-term':>12}  {'math.exp':>12}  {'abs err':>12}")
     print(f"  {'-'*6}  {'-'*12}  {'-'*12}  {'-'*12}")
     for xv in [-1.0, -0.5, 0.0, 0.5, 1.0, 1.5, 2.0]:
-        poly5 = sum((xv**k) / _factorial(k) for k in range(5))
+        poly5 = _poly5(xv)
         exact = math.exp(xv)
         print(f"  {xv:6.2f}  {poly5:12.7f}  {exact:12.7f}  {abs(poly5-exact):12.2e}")
 
     return 0 if total_fail == 0 else 1
 
 
-def _factorial(n):
-    r = 1
-    for i in range(2, n + 1):
-        r *= i
-    return r
-
-
 if __name__ == "__main__":
     sys.exit(main())
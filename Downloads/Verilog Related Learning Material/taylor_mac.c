@@ -0,0 +1,63 @@
+/*
+ * taylor_mac.c
+ * Optional SIMD kernel for TaylorPolyPipeline.evaluate_batch in
+ * simulate_taylor.py (DATA_WIDTH = 32 only).
+ *
+ * One Horner stage over n samples, in place:
+ *     acc[i] = coeff + ((acc[i] * dx[i]) >> frac_bits)     (wrapped to 32 bits)
+ *
+ * The product is formed at full 64-bit width and bits
+ * [frac_bits+31 : frac_bits] are kept, exactly as the RTL does.  Those bits
+ * are the same for a logical and an arithmetic shift when frac_bits <= 32,
+ * so AVX2's missing 64-bit arithmetic shift is not needed.
+ *
+ * Build (loaded through ctypes; simulate_taylor.py falls back to NumPy):
+ *     cc -O3 -mavx2 -shared -fPIC -o libtaylor_mac.so taylor_mac.c
+ */
+
+#include <stddef.h>
+#include <stdint.h>
+
+#if defined(__AVX2__)
+#include <immintrin.h>
+#endif
+
+#if defined(_WIN32)
+#define TAYLOR_EXPORT __declspec(dllexport)
+#else
+#define TAYLOR_EXPORT
+#endif
+
+TAYLOR_EXPORT void taylor_mac(int32_t *acc, const int32_t *dx, int32_t coeff,
+                              int frac_bits, size_t n)
+{
+    size_t i = 0;
+
+#if defined(__AVX2__)
+    const __m256i c  = _mm256_set1_epi32(coeff);
+    const __m128i sh = _mm_cvtsi32_si128(frac_bits);
+
+    for (; i + 8 <= n; i += 8) {
+        __m256i a = _mm256_loadu_si256((const __m256i *)(acc + i));
+        __m256i d = _mm256_loadu_si256((const __m256i *)(dx + i));
+
+        /* Signed 32x32->64 products of the even and the odd lanes */
+        __m256i pe = _mm256_mul_epi32(a, d);
+        __m256i po = _mm256_mul_epi32(_mm256_srli_epi64(a, 32),
+                                      _mm256_srli_epi64(d, 32));
+
+        /* Truncate: keep the low 32 bits of each shifted product and put
+           the odd-lane results back into the odd 32-bit slots */
+        pe = _mm256_srl_epi64(pe, sh);
+        po = _mm256_slli_epi64(_mm256_srl_epi64(po, sh), 32);
+        __m256i p = _mm256_blend_epi32(pe, po, 0xAA);
+
+        _mm256_storeu_si256((__m256i *)(acc + i), _mm256_add_epi32(p, c));
+    }
+#endif
+
+    for (; i < n; i++) {
+        uint64_t prod = (uint64_t)((int64_t)acc[i] * (int64_t)dx[i]);
+        acc[i] = (int32_t)((uint32_t)coeff + (uint32_t)(prod >> frac_bits));
+    }
+}